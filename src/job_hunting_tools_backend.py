@@ -1,61 +1,318 @@
+from __future__ import annotations
+
+import os
+import logging
 import json
+import shutil
 import datetime
-import gspread
+import threading
+import orjson
 from pathlib import Path
-from google.oauth2.service_account import Credentials
-from job_hunting_tools.src.logger_setup import start_logger
+from typing import TYPE_CHECKING
+from job_hunting_tools.src.logger_setup import LOGGER_NAME
+
+if TYPE_CHECKING:
+    import gspread
+
+LOG = logging.getLogger(LOGGER_NAME)
+
+# authenticated clients keyed by (creds_path, scopes) and worksheets keyed by
+# (spreadsheet_id, tab_name) so repeat updates skip the lookups
+_CLIENT_CACHE: dict = {}
+_SHEET_CACHE: dict = {}
+
+# parsed service account JSON keyed by creds_path, it is dropped together with the
+# client on an auth failure so it only saves a read when the same key file is used
+# with different scopes, the UI always uses the same scopes so there it is inert
+_CREDS_JSON_CACHE: dict[str, dict] = {}
+
+# updates run on worker threads so guard the client cache while it is filled
+# and the pending rows queue while it is read and cleared
+_CLIENT_LOCK = threading.Lock()
+_QUEUE_LOCK = threading.Lock()
+
+# company folders already created by this process so they are not made again
+_ENSURED_DIRS: set[Path] = set()
+_ENSURED_DIRS_LOCK = threading.Lock()
 
-LOG = start_logger()
+# where the company folders and the log of every job applied for are kept
+_JOB_ROOT_PATH = r"D:\storage\documents\job_hunting\companies_applied_for"
+_APPLICATIONS_LOG_NAME = "applications.jsonl"
+
+# maps the characters that get swapped out when building file and folder names
+_NORMALIZE = str.maketrans({" ": "_"})
+
+def _normalize(name: str) -> str:
+    """
+    This will standardize a name for use in file and folder names
+
+    Args:
+        name (str): The name to standardize
+
+    Returns:
+        str: The name with spaces swapped for underscores and made lowercase
+    """
+    return name.translate(_NORMALIZE).lower()
 
 def log_google_sheet_data(
         creds_path: str,
-        scopes: list,
-        sheet_name: str,
+        scopes: tuple | list,
+        spreadsheet_id: str,
         data: list,
         tab_name: None | str = None) -> str:
     """
-    This will log data to a google sheet
+    This will log data to a google sheet, the rows are queued first so
+    anything that failed to upload before goes up in the same request
 
     Args:
         creds_path (str): The path to the service account credentials JSON file
-        scopes (list): The list of scopes to use for the authentication
-        sheet_name (str): The name of the google sheet to update
+        scopes (tuple | list): The scopes to use for the authentication
+        spreadsheet_id (str): The ID of the google sheet to update, taken from the sheet URL
         data (list): The data to append to the google sheet
         tab_name (str | None): The name of the tab to update, if None, the first tab will be used
 
     Returns:
         msg (str): The message to log if the action worked out
     """
-    client = authenticate_google_sheets(creds_path, scopes)
+    try:
+        with _QUEUE_LOCK:
+            queue_google_sheet_rows(_pending_queue_path(creds_path), data, spreadsheet_id, tab_name)
+    except OSError as e:
+        # the queue is only a safety net, still send the rows if it can not be written
+        LOG.warning(f"Could not queue the rows, sending them directly: {e}")
+        return flush_pending(creds_path, scopes, spreadsheet_id, tab_name, unqueued_rows=data)
+
+    return flush_pending(creds_path, scopes, spreadsheet_id, tab_name)
+
+def _pending_queue_path(creds_path: str) -> Path:
+    """
+    This will get the path of the pending rows queue for a credentials file
+
+    Args:
+        creds_path (str): The path to the service account credentials JSON file
+
+    Returns:
+        Path: The path to the pending rows queue, next to the credentials file
+    """
+    return Path(creds_path).parent / "pending_applications.jsonl"
+
+def queue_google_sheet_rows(
+        queue_path: Path,
+        data: list,
+        spreadsheet_id: str,
+        tab_name: None | str = None) -> None:
+    """
+    This will add rows to the pending queue to be sent to the google sheet,
+    each row keeps the sheet and tab it is meant for
+
+    Args:
+        queue_path (Path): The path to the pending rows queue
+        data (list): The rows to queue
+        spreadsheet_id (str): The ID of the google sheet the rows are for
+        tab_name (str | None): The name of the tab the rows are for, if None, the first tab
+    """
+    with queue_path.open("a+b") as f:
+        # a line cut off by an interrupted write would swallow the first new row,
+        # so make sure the new rows start on a line of their own
+        f.seek(0, os.SEEK_END)
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+        for row in data:
+            entry = {"spreadsheet_id": spreadsheet_id, "tab_name": tab_name, "row": row}
+            f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+
+def _read_pending_entries(queue_path: Path) -> list:
+    """
+    This will read the rows waiting in the pending queue, lines that are not
+    valid queue entries are logged and skipped so they can not block the queue
+
+    Args:
+        queue_path (Path): The path to the pending rows queue
 
+    Returns:
+        list: The queued entries, each a dict with spreadsheet_id, tab_name and row
+    """
     try:
-        update_google_sheet(client, sheet_name, data, tab_name)
-        msg = f"Google sheet '{sheet_name}' updated successfully."
-    except Exception as e:
-        msg = f"An error occurred while updating the google sheet: {e}"
+        with queue_path.open("r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        LOG.warning(f"Could not read the pending rows queue {queue_path}: {e}")
+        return []
+
+    entries = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            entry = None
+
+        if not isinstance(entry, dict) or not {"spreadsheet_id", "tab_name", "row"} <= entry.keys():
+            LOG.warning(f"Skipping invalid line {line_number} in {queue_path}: {line.strip()}")
+            continue
+
+        entries.append(entry)
+
+    return entries
+
+def flush_pending(
+        creds_path: str,
+        scopes: tuple | list,
+        spreadsheet_id: str,
+        tab_name: None | str = None,
+        unqueued_rows: None | list = None) -> str:
+    """
+    This will send every row queued for this sheet and tab in a single request
+    and remove them from the queue once the sheet is updated, rows queued for
+    any other sheet or tab are left in the queue
+
+    Args:
+        creds_path (str): The path to the service account credentials JSON file
+        scopes (tuple | list): The scopes to use for the authentication
+        spreadsheet_id (str): The ID of the google sheet to update, taken from the sheet URL
+        tab_name (str | None): The name of the tab to update, if None, the first tab will be used
+        unqueued_rows (list | None): Newer rows that could not be added to the queue to send as well
+
+    Returns:
+        msg (str): The message to log if the action worked out
+    """
+    queue_path = _pending_queue_path(creds_path)
+    unqueued_rows = unqueued_rows or []
+
+    with _QUEUE_LOCK:
+        entries = _read_pending_entries(queue_path)
+
+        queued_rows = []
+        other_entries = []
+        for entry in entries:
+            if entry["spreadsheet_id"] == spreadsheet_id and entry["tab_name"] == tab_name:
+                queued_rows.append(entry["row"])
+            else:
+                other_entries.append(entry)
+
+        waiting_msg = ""
+        if other_entries:
+            waiting_msg = f"\n{len(other_entries)} row(s) still waiting in the queue for another sheet or tab."
+
+        # rows are queued oldest first but the sheet lists the newest job at the top
+        rows = queued_rows + list(unqueued_rows)
+        rows.reverse()
+
+        if not rows:
+            msg = f"No pending rows to send to the google sheet.{waiting_msg}"
+            LOG.info(msg)
+            return msg
+
+        client = authenticate_google_sheets(creds_path, scopes)
+
+        from google.auth.exceptions import GoogleAuthError, RefreshError
+        from gspread.exceptions import APIError, GSpreadException
+
+        kept_msg = f"{len(queued_rows)} row(s) kept for next time"
+        if unqueued_rows:
+            kept_msg += f", {len(unqueued_rows)} row(s) could not be queued and were not sent"
+
+        try:
+            update_google_sheet(client, spreadsheet_id, rows, tab_name)
+            msg = f"Google sheet '{spreadsheet_id}' updated successfully with {len(rows)} row(s).{waiting_msg}"
+
+            # keep only the rows that are waiting on a different sheet or tab
+            try:
+                if other_entries:
+                    queue_path.write_text(
+                        "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in other_entries),
+                        encoding="utf-8",
+                    )
+                elif entries:
+                    queue_path.unlink(missing_ok=True)
+            except OSError as e:
+                msg += f"\nThe sent rows could not be removed from the queue and may be sent again: {e}"
+        except RefreshError as e:
+            # google auth refreshes the token itself on a 401, a revoked or replaced
+            # key shows up here instead so forget it and read the key file again next time
+            _forget_credentials(creds_path, scopes)
+            msg = f"An error occurred while updating the google sheet, {kept_msg}: {e}{waiting_msg}"
+        except APIError as e:
+            if e.code == 401:
+                # the cached credentials are no longer valid, start fresh next time
+                _forget_credentials(creds_path, scopes)
+            msg = f"An error occurred while updating the google sheet, {kept_msg}: {e}{waiting_msg}"
+        except (GSpreadException, GoogleAuthError, OSError) as e:
+            msg = f"An error occurred while updating the google sheet, {kept_msg}: {e}{waiting_msg}"
 
     LOG.info(msg)
 
     return msg
 
-def authenticate_google_sheets(creds_path: str, scopes: list) -> gspread.Client:
+def _forget_credentials(creds_path: str, scopes: tuple | list) -> None:
+    """
+    This will drop the cached client, key file and worksheets for a credentials
+    file so the next update authenticates from scratch
+
+    Args:
+        creds_path (str): The path to the service account credentials JSON file
+        scopes (tuple | list): The scopes the client was authenticated with
+    """
+    with _CLIENT_LOCK:
+        _CLIENT_CACHE.pop((creds_path, tuple(scopes)), None)
+        _CREDS_JSON_CACHE.pop(creds_path, None)
+    _SHEET_CACHE.clear()
+
+def authenticate_google_sheets(creds_path: str, scopes: tuple | list) -> gspread.Client:
     """
     This will authenticate the google sheets API using a service account
 
     Args:
         creds_path (str): The path to the service account credentials JSON file
-        scopes (list): The list of scopes to use for the authentication
+        scopes (tuple | list): The scopes to use for the authentication
 
     Returns:
         gspread.Client: The authenticated gspread client
     """
-    creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
+    cache_key = (creds_path, tuple(scopes))
+
+    with _CLIENT_LOCK:
+        if cache_key in _CLIENT_CACHE:
+            return _CLIENT_CACHE[cache_key]
 
-    return gspread.authorize(creds)
+        # imported here as gspread and google auth are slow to load and only
+        # needed once the user actually updates a sheet
+        import gspread
+        from google.oauth2.service_account import Credentials
+
+        if creds_path not in _CREDS_JSON_CACHE:
+            with Path(creds_path).open("r", encoding="utf-8") as f:
+                _CREDS_JSON_CACHE[creds_path] = json.load(f)
+
+        creds = Credentials.from_service_account_info(_CREDS_JSON_CACHE[creds_path], scopes=scopes)
+        client = gspread.authorize(creds)
+
+        # keep connections to google alive between updates and retry the
+        # read requests that fail with a temporary server error
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        client.http_client.session.mount("https://", adapter)
+
+        _CLIENT_CACHE[cache_key] = client
+
+    return client
 
 def update_google_sheet(
         google_client: gspread.Client,
-        sheet_name: str,
+        spreadsheet_id: str,
         data: list,
         tab_name: None | str = None) -> None:
     """
@@ -64,50 +321,164 @@ def update_google_sheet(
     Args:
         google_client (gspread.Client): The authenticated gspread client
         data (list): The data to append to the google sheet
-        sheet_name (str): The name of the google sheet to update
+        spreadsheet_id (str): The ID of the google sheet to update, taken from the sheet URL
         tab_name (str | None): The name of the tab to update, if None, the first tab will be used
     """
-    spreadsheet = google_client.open(sheet_name)
-    if tab_name:
-        sheet = spreadsheet.worksheet("Jobs Applied For")
-    else:
-        sheet = spreadsheet.get_worksheet(0)
+    from gspread.exceptions import APIError
 
-    # insert a blank for first
-    sheet.insert_row([], index=2)
+    cache_key = (spreadsheet_id, tab_name)
+    was_cached = cache_key in _SHEET_CACHE
+    sheet = _get_worksheet(google_client, spreadsheet_id, tab_name)
 
-    # add data to the sheet
-    sheet.append_rows(
-        data,
-        table_range="A2",
-    )
+    try:
+        _insert_sheet_rows(sheet, data)
+    except APIError as e:
+        if not was_cached or not _is_stale_worksheet_error(e):
+            raise
+
+        # the cached worksheet is gone, look it up again and retry once
+        LOG.debug(f"Cached worksheet is stale, reopening: {spreadsheet_id} {tab_name}")
+        _SHEET_CACHE.pop(cache_key, None)
+        sheet = _get_worksheet(google_client, spreadsheet_id, tab_name)
+        _insert_sheet_rows(sheet, data)
+
+def _is_stale_worksheet_error(error: gspread.exceptions.APIError) -> bool:
+    """
+    This will check if an API error means a cached worksheet no longer exists,
+    a deleted or recreated tab makes a batch update fail with a 400 naming the
+    missing grid rather than a 404
 
-def write_json_file(position: str, company_name: str, json_file_path: Path, job_description: str, resume_used_path: str) -> None:
+    Args:
+        error (gspread.exceptions.APIError): The error the update failed with
+
+    Returns:
+        bool: True if the worksheet should be looked up again
     """
-    This will write a JSON file in a directory given
+    if error.code in (404, 410):
+        return True
+
+    message = str(error.error.get("message", ""))
+
+    return error.code == 400 and "No grid with id" in message
+
+def _get_worksheet(
+        google_client: gspread.Client,
+        spreadsheet_id: str,
+        tab_name: None | str = None) -> gspread.Worksheet:
+    """
+    This will get a worksheet from the cache or open it if it is not cached yet
+
+    Args:
+        google_client (gspread.Client): The authenticated gspread client
+        spreadsheet_id (str): The ID of the google sheet the tab is in
+        tab_name (str | None): The name of the tab to get, if None, the first tab will be used
+
+    Returns:
+        gspread.Worksheet: The worksheet to write to
+    """
+    sheet = _SHEET_CACHE.get((spreadsheet_id, tab_name))
+    if sheet is None:
+        spreadsheet = google_client.open_by_key(spreadsheet_id)
+        if tab_name:
+            sheet = spreadsheet.worksheet(tab_name)
+        else:
+            sheet = spreadsheet.get_worksheet(0)
+        _SHEET_CACHE[(spreadsheet_id, tab_name)] = sheet
+
+    return sheet
+
+def _insert_sheet_rows(sheet: gspread.Worksheet, data: list) -> None:
+    """
+    This will insert rows under the header of a worksheet and fill them
+    in a single batch request
+
+    Args:
+        sheet (gspread.Worksheet): The worksheet to insert the rows into
+        data (list): The rows to insert
+    """
+    sheet.spreadsheet.batch_update({
+        "requests": [
+            {
+                "insertDimension": {
+                    "range": {
+                        "sheetId": sheet.id,
+                        "dimension": "ROWS",
+                        "startIndex": 1,
+                        "endIndex": 1 + len(data),
+                    },
+                    "inheritFromBefore": False,
+                }
+            },
+            {
+                "updateCells": {
+                    "start": {"sheetId": sheet.id, "rowIndex": 1, "columnIndex": 0},
+                    "rows": [
+                        {"values": [{"userEnteredValue": {"stringValue": str(value)}} for value in row]}
+                        for row in data
+                    ],
+                    "fields": "userEnteredValue",
+                }
+            },
+        ]
+    })
+
+def write_json_file(
+        position: str,
+        company_name: str,
+        json_file_path: Path,
+        job_description: str,
+        resume_used_path: str,
+        applied_at: None | datetime.datetime = None) -> None:
+    """
+    This will add a job record as a new line to a JSON lines file
 
     Args:
         position (str): The position name of the job
         company_name (str): The name of the company the job is for
-        json_file_path (Path): The path to the JSON file to write
+        json_file_path (Path): The path to the JSON lines file to add the record to
         job_description (str): The job description text
         resume_used_path (str): The path to the resume used for the job application
+        applied_at (datetime.datetime | None): When the job was applied for, if None, now will be used
     """
+    if applied_at is None:
+        applied_at = datetime.datetime.now()
 
     # build json data structure
     job_data = {
         "job_description": job_description,
         "position_name": position,
         "company_name": company_name,
-        "date_applied": datetime.datetime.now().isoformat(),
+        "date_applied": applied_at,
         "resume_used_path": resume_used_path,
     }
 
-    # write the JSON file
-    with json_file_path.open("w", encoding="utf-8") as f:
-        json.dump(job_data, f, ensure_ascii=False, indent=4)
+    # add the record to the file, orjson formats the datetime itself
+    _append_file_bytes(
+        json_file_path,
+        orjson.dumps(
+            job_data,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_OMIT_MICROSECONDS | orjson.OPT_APPEND_NEWLINE,
+        ),
+    )
+
+def _append_file_bytes(file_path: Path, data: bytes) -> None:
+    """
+    This will append bytes to a file, the folder is only created when the
+    write fails because it is missing as it almost always exists already
 
-def create_folder_structure(company_name: str, job_root_path: str = r"D:\storage\documents\job_hunting\companies_applied_for", ) -> Path:
+    Args:
+        file_path (Path): The path to the file to append to
+        data (bytes): The data to append to the file
+    """
+    try:
+        with file_path.open("ab") as f:
+            f.write(data)
+    except FileNotFoundError:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with file_path.open("ab") as f:
+            f.write(data)
+
+def create_folder_structure(company_name: str, job_root_path: str = _JOB_ROOT_PATH, ) -> Path:
     """
     This will create the folder structure for the job application
 
@@ -116,7 +487,7 @@ def create_folder_structure(company_name: str, job_root_path: str = r"D:\storage
         job_root_path (str): The root path where the job folders will be created
     """
     # standardize the company name to remove spaces and make lowercase
-    company_name = company_name.replace(" ", "_").lower()
+    company_name = _normalize(company_name)
 
     # create the root path object
     root_path = Path(job_root_path)
@@ -124,30 +495,62 @@ def create_folder_structure(company_name: str, job_root_path: str = r"D:\storage
     # create the company folder path
     company_folder_path = root_path / company_name
 
-    # create the company folder if it does not exist
-    company_folder_path.mkdir(parents=True, exist_ok=True)
+    # create the company folder if this process has not already done so
+    with _ENSURED_DIRS_LOCK:
+        if company_folder_path not in _ENSURED_DIRS:
+            company_folder_path.mkdir(parents=True, exist_ok=True)
+            _ENSURED_DIRS.add(company_folder_path)
 
     return company_folder_path
 
-def copy_file_to_path(source_path: Path, destination_path: Path) -> None:
+def copy_file_to_path(source_path: Path, destination_path: Path) -> str:
     """
     This will copy a file to a destination path
 
     Args:
         source_path (Path): The path to the source file
         destination_path (Path): The path to the destination folder
+
+    Returns:
+        msg (str): The message to log if the action worked out
     """
-    if not source_path.exists():
-        LOG.error(f"Source file does not exist: {source_path}")
-        return
+    try:
+        shutil.copyfile(source_path, destination_path)
+    except FileNotFoundError:
+        if not source_path.exists():
+            msg = f"Source file does not exist: {source_path}"
+            LOG.error(msg)
+            return msg
+
+        # the destination folder was removed after this process created it,
+        # forget it was made and create it again before retrying the copy
+        try:
+            with _ENSURED_DIRS_LOCK:
+                _ENSURED_DIRS.discard(destination_path.parent)
+                destination_path.parent.mkdir(parents=True, exist_ok=True)
+                _ENSURED_DIRS.add(destination_path.parent)
+
+            shutil.copyfile(source_path, destination_path)
+        except OSError as e:
+            msg = f"Destination folder could not be created: {destination_path.parent}\nError: {e}"
+            LOG.error(msg)
+            return msg
+    except OSError as e:
+        msg = f"Failed to copy file from {source_path} to {destination_path}\nError: {e}"
+        LOG.error(msg)
+        return msg
 
-    with source_path.open("rb") as src_file:
-        with destination_path.open("wb") as dest_file:
-            dest_file.write(src_file.read())
+    msg = f"Copied file from {source_path} to {destination_path}"
+    LOG.debug(msg)
 
-    LOG.debug(f"Copied file from {source_path} to {destination_path}")
+    return msg
 
-def log_job_applied_for(company_name: str, position: str, job_description: str, resume_used_path: str) -> str:
+def log_job_applied_for(
+        company_name: str,
+        position: str,
+        job_description: str,
+        resume_used_path: str,
+        applied_at: None | datetime.datetime = None) -> str:
     """
     This will log a job information I need to keep track of
     what a job is asking for as requirements for future details.
@@ -157,40 +560,37 @@ def log_job_applied_for(company_name: str, position: str, job_description: str,
         position (str): The position name of the job
         job_description (str): The job description text
         resume_used_path (str): The path to the resume used for the job application
+        applied_at (datetime.datetime | None): When the job was applied for, if None, now will be used
 
     Returns:
         msg (str): The message to log if the action worked out
     """
-    # create the folder structure for the job applying for
-    path_structure = create_folder_structure(company_name)
-
-    # create a new JSON file with the information highlighted
-    file_name = f"{company_name}_{position}"
-    jsong_name = f"{file_name.replace(" ", "_").lower()}_{1:03d}_job_description.json"
-
-    if (path_structure / jsong_name).exists():
-        LOG.debug(f"Job description file already exists!\nFile: {jsong_name}\nPath: {path_structure}")
-        files = [file for file in path_structure.iterdir() if file.is_file()]
-        new_file_index = 1
-        for file in files:
-            if file.name.startswith(file_name.replace(" ", "_").lower()+"_"):
-                new_file_index += 1
-        jsong_name = f"{file_name.replace(' ', '_').lower()}_{new_file_index:03d}_job_description.json"
-
-    json_file_path = path_structure / jsong_name
+    # every job is added to a single log file in the root of the job folders
+    json_file_path = Path(_JOB_ROOT_PATH) / _APPLICATIONS_LOG_NAME
 
     try:
-        write_json_file(position, company_name, json_file_path, job_description, resume_used_path)
-        msg = f"Job description saved!\nFile: {jsong_name}\nPath: {path_structure}"
+        write_json_file(position, company_name, json_file_path, job_description, resume_used_path, applied_at)
+        msg = f"Job description saved!\nFile: {json_file_path.name}\nPath: {json_file_path.parent}"
     except Exception as e:
         msg = f"Failed to save job description file.\nError: {e}"
         LOG.error(msg)
 
     LOG.info(msg)
 
-    # copy the file to the location path
-    scr_path = Path(resume_used_path)
-    destination_path = Path(path_structure) / scr_path.name
-    copy_file_to_path(scr_path, destination_path)
-
-    return msg
\ No newline at end of file
+    # copy the resume to the company folder, the record is already saved so a
+    # failure here is reported in the message instead of raised
+    if not resume_used_path:
+        copy_msg = "No resume path given, the resume was not copied."
+        LOG.warning(copy_msg)
+    else:
+        try:
+            path_structure = create_folder_structure(company_name)
+        except OSError as e:
+            copy_msg = f"Failed to create the company folder, the resume was not copied.\nError: {e}"
+            LOG.error(copy_msg)
+        else:
+            scr_path = Path(resume_used_path)
+            destination_path = path_structure / scr_path.name
+            copy_msg = copy_file_to_path(scr_path, destination_path)
+
+    return f"{msg}\n{copy_msg}"
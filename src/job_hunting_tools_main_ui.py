@@ -1,15 +1,17 @@
 import datetime
 import json
+import logging
 import sys
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from job_hunting_tools.src.job_hunting_tools_backend import (
     log_google_sheet_data,
     log_job_applied_for,
 )
-from job_hunting_tools.src.logger_setup import start_logger
-from PySide6.QtCore import Qt
+from job_hunting_tools.src.logger_setup import LOGGER_NAME
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import (
     QApplication,
@@ -27,11 +29,107 @@ from PySide6.QtWidgets import (
     QPlainTextEdit
 )
 
-LOG = start_logger()
+LOG = logging.getLogger(LOGGER_NAME)
+
+_SCOPES = (
+    "https://www.googleapis.com/auth/spreadsheets",
+)
 
 _app = None
 _window = None
 
+def _format_date(date: datetime.date) -> str:
+    """
+    This will format a date the way the google sheet expects it, M/D/YYYY
+    with no leading zeros
+
+    Args:
+        date (datetime.date): The date to format
+
+    Returns:
+        str: The formatted date
+    """
+    return f"{date.month}/{date.day}/{date.year}"
+
+class _JobTaskSignals(QObject):
+    """
+    Signals the job task uses to report back to the UI thread
+    """
+    done = Signal(str, str)
+
+class _JobTask(QRunnable):
+    """
+    Background task that logs the job application and updates the google sheet
+    so the UI does not freeze while waiting on the disk and network
+    """
+    def __init__(
+            self,
+            company_name: str,
+            position: str,
+            job_description: str,
+            resume_used_path: str,
+            creds_path: str,
+            scopes: tuple | list,
+            spreadsheet_id: str,
+            google_sheet_data: list,
+            tab_name: None | str = None,
+            applied_at: None | datetime.datetime = None):
+        super().__init__()
+
+        self.signals = _JobTaskSignals()
+
+        self.company_name = company_name
+        self.position = position
+        self.job_description = job_description
+        self.resume_used_path = resume_used_path
+        self.creds_path = creds_path
+        self.scopes = scopes
+        self.spreadsheet_id = spreadsheet_id
+        self.google_sheet_data = google_sheet_data
+        self.tab_name = tab_name
+        self.applied_at = applied_at
+
+    def run(self) -> None:
+        """
+        Log the job application and update the google sheet
+        """
+        # the local files and the google sheet do not depend on each other
+        # so write them at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            job_log_future = executor.submit(
+                log_job_applied_for,
+                self.company_name,
+                self.position,
+                self.job_description,
+                self.resume_used_path,
+                self.applied_at
+            )
+            google_sheet_future = executor.submit(
+                log_google_sheet_data,
+                self.creds_path,
+                self.scopes,
+                self.spreadsheet_id,
+                self.google_sheet_data,
+                self.tab_name
+            )
+
+        # check each result on its own so one failing does not hide that the other worked.
+        # any error has to be caught here, this runs on a worker thread and the UI is
+        # only told the task finished through the done signal
+        try:
+            job_log_result = job_log_future.result()
+        except Exception as e:  # noqa: BLE001
+            job_log_result = f"Failed to save the job application.\nError: {e}"
+            LOG.error(job_log_result)
+
+        try:
+            google_sheet_result = google_sheet_future.result()
+        except Exception as e:  # noqa: BLE001
+            google_sheet_result = f"Failed to update the google sheet.\nError: {e}"
+            LOG.error(google_sheet_result)
+
+        self.signals.done.emit(job_log_result, google_sheet_result)
+
 class AboutDialog(QDialog):
     def __init__(self, version: str, parent=None):
         super().__init__(parent)
@@ -174,7 +272,7 @@ class MainWindow(QMainWindow):
             "Date:",
             "Resume Used:",
             "Google Sheet Credential Path:",
-            "Google Sheet Name:",
+            "Google Sheet ID:",
             "Google Sheet Tab Name:",
             "Job Description:"
         ]
@@ -186,33 +284,41 @@ class MainWindow(QMainWindow):
 
         main_layout.addWidget(tool_description_label)
 
+        # line edit fields keyed by their label name without the colon and a
+        # live copy of their values kept up to date as the user types
+        self._fields: dict[str, QLineEdit] = {}
+        self._state: dict[str, str] = {}
+
         for label_name in labels_fields:
             label = QLabel(label_name)
             main_layout.addWidget(label)
             if label_name == "Date:":
                 self.date_field = QLineEdit()
-                self.date_field.setText(
-                    f"{datetime.date.today().strftime('%m/%d/%Y').lstrip('0').replace('/0', '/')}"
-                )
+                self.date_field.setText(_format_date(datetime.date.today()))
                 main_layout.addWidget(self.date_field)
+                self._register_field(label_name, self.date_field)
                 main_layout.addWidget(self.set_date_btn)
             elif label_name == "Google Sheet Credential Path:":
                 self.google_sheet_credential_path_field = QLineEdit()
                 main_layout.addWidget(self.google_sheet_credential_path_field)
+                self._register_field(label_name, self.google_sheet_credential_path_field)
                 main_layout.addWidget(self.set_google_sheet_credential_path_btn)
             elif label_name == "Work Location:":
                 self.work_mode_dropdown = QComboBox()
                 self.work_mode_dropdown.addItems(["Onsite", "Hybrid", "Remote"])
                 main_layout.addWidget(self.work_mode_dropdown)
+                self._register_dropdown(label_name, self.work_mode_dropdown)
             elif label_name == "Job Description:":
                 main_layout.addWidget(self.job_description)
             elif label_name == "Resume Used:":
                 self.resume_path_field = QLineEdit()
                 main_layout.addWidget(self.resume_path_field)
+                self._register_field(label_name, self.resume_path_field)
                 main_layout.addWidget(self.resume_path_field_btn)
             else:
                 field = QLineEdit()
                 main_layout.addWidget(field)
+                self._register_field(label_name, field)
 
         main_layout.addWidget(self.update_records_btn)
         main_layout.addWidget(states_description_label)
@@ -222,6 +328,31 @@ class MainWindow(QMainWindow):
         scroll_area.setWidget(content_widget)
         self.setCentralWidget(scroll_area)
 
+    def _register_field(self, label_name: str, field: QLineEdit) -> None:
+        """
+        Track a line edit field by its label and keep its value in the live state
+
+        Args:
+            label_name (str): The label text shown above the field
+            field (QLineEdit): The field to track
+        """
+        key = label_name.rstrip(":")
+        self._fields[key] = field
+        self._state[key] = field.text()
+        field.textChanged.connect(lambda text: self._state.__setitem__(key, text))
+
+    def _register_dropdown(self, label_name: str, dropdown: QComboBox) -> None:
+        """
+        Keep a dropdown's current value in the live state by its label
+
+        Args:
+            label_name (str): The label text shown above the dropdown
+            dropdown (QComboBox): The dropdown to track
+        """
+        key = label_name.rstrip(":")
+        self._state[key] = dropdown.currentText()
+        dropdown.currentTextChanged.connect(lambda text: self._state.__setitem__(key, text))
+
     def _create_menu(self) -> None:
         """
         Create the menu bar with File -> Exit
@@ -273,12 +404,10 @@ class MainWindow(QMainWindow):
         """
         Connect signals (events) to methods.
         """
-        current_date = f"{datetime.date.today().strftime('%m/%d/%Y').lstrip('0').replace('/0', '/')}"
-
         self.update_records_btn.clicked.connect(self._update_records)
         self.set_google_sheet_credential_path_btn.clicked.connect(self._set_google_sheet_credential_path)
         self.resume_path_field_btn.clicked.connect(self._set_resume_path)
-        self.set_date_btn.clicked.connect(lambda: self.date_field.setText(current_date))
+        self.set_date_btn.clicked.connect(self._set_date_to_today)
 
         self.save_preset.triggered.connect(self._save_field_presets)
         self.load_preset.triggered.connect(self._load_field_presets)
@@ -288,6 +417,12 @@ class MainWindow(QMainWindow):
 
         self.about_project.triggered.connect(self._show_about_dialog)
 
+    def _set_date_to_today(self) -> None:
+        """
+        This will set the date field to today's date
+        """
+        self.date_field.setText(_format_date(datetime.date.today()))
+
     def _show_about_dialog(self):
         dlg = AboutDialog(self.version, self)
         dlg.exec()
@@ -298,8 +433,6 @@ class MainWindow(QMainWindow):
         """
         field_data = self._gather_field_information()
 
-        field_data["Work Location"] = self.work_mode_dropdown.currentText()
-
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Save Preset", "", "JSON Files (*.json)"
         )
@@ -364,14 +497,8 @@ class MainWindow(QMainWindow):
             )
             return
 
-        field_data = {}
-        for widget in self.centralWidget().findChildren(QLineEdit):
-            label = widget.previousInFocusChain()
-            if isinstance(label, QLabel):
-                field_data[label.text().strip(":")] = widget
-
         # Populate fields safely
-        for key, widget in field_data.items():
+        for key, widget in self._fields.items():
             value = data.get(key, "")
             widget.setText(value)
 
@@ -389,13 +516,7 @@ class MainWindow(QMainWindow):
         Returns:
             field_data (dict): A dictionary with all the field names and their values
         """
-        field_data = {}
-        for widget in self.centralWidget().findChildren(QLineEdit):
-            label = widget.previousInFocusChain()
-            if isinstance(label, QLabel):
-                field_data[label.text().strip(":")] = widget.text()
-
-        return field_data
+        return dict(self._state)
 
     def _update_records(self) -> None:
         """
@@ -409,11 +530,11 @@ class MainWindow(QMainWindow):
         website = field_data["Website"]
         job_email = field_data["Job Email"]
         location = field_data["Company Location"]
-        work_location = self.work_mode_dropdown.currentText()
+        work_location = field_data["Work Location"]
         date = field_data["Date"]
         industry = field_data["Industry"]
         creds_path = field_data["Google Sheet Credential Path"]
-        sheet_name = field_data["Google Sheet Name"]
+        spreadsheet_id = field_data["Google Sheet ID"]
         tab_name = field_data["Google Sheet Tab Name"]
         resume_used_path = field_data["Resume Used"]
         google_sheet_data = [
@@ -429,27 +550,42 @@ class MainWindow(QMainWindow):
             ]
         ]
 
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-
-        if not creds_path or not sheet_name:
+        if not creds_path or not spreadsheet_id:
             LOG.error(
-                "Google Sheet Credential Path and Sheet Name are required to update records."
+                "Google Sheet Credential Path and Sheet ID are required to update records."
             )
             return
 
         job_description=self.job_description.toPlainText()
-        job_log_result = log_job_applied_for(company_name, position, job_description, resume_used_path)
-        google_sheet_result = log_google_sheet_data(
+        task = _JobTask(
+            company_name,
+            position,
+            job_description,
+            resume_used_path,
             creds_path,
-            scopes,
-            sheet_name,
+            _SCOPES,
+            spreadsheet_id,
             google_sheet_data,
-            tab_name
+            tab_name,
+            datetime.datetime.now()
         )
+        task.signals.done.connect(self._records_updated)
+
+        # stop double submits while the task is running
+        self.update_records_btn.setEnabled(False)
+        self.states_lable.setText("Updating records...")
+        QThreadPool.globalInstance().start(task)
+
+    def _records_updated(self, job_log_result: str, google_sheet_result: str) -> None:
+        """
+        Show the results of the update records task and re-enable the button
+
+        Args:
+            job_log_result (str): The message from logging the job application
+            google_sheet_result (str): The message from updating the google sheet
+        """
         self.states_lable.setText(f"{job_log_result}\n{google_sheet_result}")
+        self.update_records_btn.setEnabled(True)
 
 def show_ui() -> MainWindow:
     """
@@ -472,6 +608,12 @@ def show_ui() -> MainWindow:
 
     return _window
 
-# start the UI
-show_ui()
-sys.exit(_app.exec())
\ No newline at end of file
+def main() -> None:
+    """
+    This will start the application and run the Qt event loop
+    """
+    show_ui()
+    sys.exit(_app.exec())
+
+if __name__ == "__main__":
+    main()
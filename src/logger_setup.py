@@ -1,5 +1,7 @@
 import logging
 
+LOGGER_NAME = "job_hunting_tools"
+
 class ColorFormatter(logging.Formatter):
     """
     Custom logging formatter to add colors based on log level
@@ -15,8 +17,9 @@ class ColorFormatter(logging.Formatter):
 
     def format(self, record):
         color = self.COLORS.get(record.levelno, self.RESET)
-        record.msg = f"{color}{record.msg}{self.RESET}"
-        return super().format(record)
+        # color the formatted message rather than the record so other handlers get it untouched
+        message = super().format(record)
+        return f"{color}{message}{self.RESET}"
 
 def start_logger(level: str = "DEBUG") -> logging.Logger:
     """
@@ -29,7 +32,7 @@ def start_logger(level: str = "DEBUG") -> logging.Logger:
         logging.Logger: The configured logger
     """
     # set logger data
-    LOG = logging.getLogger(__name__)
+    LOG = logging.getLogger(LOGGER_NAME)
     LOG.setLevel(level)
 
     # Attach the handler to your logger
@@ -43,4 +46,7 @@ def start_logger(level: str = "DEBUG") -> logging.Logger:
 
         LOG.addHandler(ch)
 
-    return LOG
\ No newline at end of file
+    return LOG
+
+# set up the shared application logger once on import
+start_logger()